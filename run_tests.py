@@ -18,18 +18,20 @@ def check_server_health(base_url="http://localhost:8000", timeout=30):
     print(f"Checking server health at {base_url}...")
     
     start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(f"{base_url}/health", timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("status") == "healthy":
-                    print("✅ Server is healthy and ready for testing")
-                    return True
-            print(f"❌ Server responded but not healthy: {response.status_code}")
-        except requests.exceptions.RequestException:
-            print("⏳ Server not ready, waiting...")
-            time.sleep(2)
+    # Reuse one keep-alive connection across polls
+    with requests.Session() as session:
+        while time.time() - start_time < timeout:
+            try:
+                response = session.get(f"{base_url}/health", timeout=5)
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get("status") == "healthy":
+                        print("✅ Server is healthy and ready for testing")
+                        return True
+                print(f"❌ Server responded but not healthy: {response.status_code}")
+            except requests.exceptions.RequestException:
+                print("⏳ Server not ready, waiting...")
+                time.sleep(2)
     
     print(f"❌ Server not available after {timeout} seconds")
     return False
@@ -41,8 +43,11 @@ def run_tests(test_args):
     print(f"Running: {' '.join(cmd)}")
     print("-" * 60)
     
+    # Only load the plugins pytest.ini asks for instead of every installed one
+    env = {**os.environ, "PYTEST_DISABLE_PLUGIN_AUTOLOAD": "1"}
+    
     try:
-        result = subprocess.run(cmd, cwd=Path(__file__).parent)
+        result = subprocess.run(cmd, cwd=Path(__file__).parent, env=env)
         return result.returncode == 0
     except KeyboardInterrupt:
         print("\n⚠️  Tests interrupted by user")
@@ -64,6 +69,7 @@ Examples:
   python run_tests.py --integration       # Run only integration tests
   python run_tests.py --with-api-keys     # Run tests requiring real API keys
   python run_tests.py --coverage          # Run with coverage report
+  python run_tests.py --parallel          # Run tests across CPU cores (pytest-xdist)
   python run_tests.py --verbose           # Run with verbose output
   python run_tests.py --file test_api_basic.py  # Run specific test file
         """
@@ -94,6 +100,8 @@ Examples:
                        help="Run with coverage report")
     parser.add_argument("--quiet", "-q", action="store_true", 
                        help="Minimal output")
+    parser.add_argument("--parallel", action="store_true", 
+                       help="Run tests in parallel with pytest-xdist")
     
     # Advanced options
     parser.add_argument("--no-server-check", action="store_true", 
@@ -146,8 +154,10 @@ Examples:
         pytest_args.append("-v")
     if args.quiet:
         pytest_args.append("-q")
+    if args.parallel:
+        pytest_args.extend(["-p", "xdist", "-n", "auto", "--dist=loadgroup"])
     if args.coverage:
-        pytest_args.extend(["--cov=src/api", "--cov-report=html", "--cov-report=term"])
+        pytest_args.extend(["-p", "pytest_cov", "--cov=src/api", "--cov-report=html", "--cov-report=term"])
     
     # Run tests
     success = run_tests(pytest_args)
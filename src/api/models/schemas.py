@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional, Any
 from enum import Enum
+import uuid
 
 class APIProvider(str, Enum):
     OPENAI = "openai"
@@ -35,6 +36,7 @@ class CrewExecutionRequest(BaseModel):
     uploaded_files: List[str] = Field(default=[], description="List of uploaded file IDs")
     agent_configs: Dict[str, AgentConfig]
     execution_mode: str = Field(default="run", description="Execution mode: run, train, test")
+    execution_id: Optional[uuid.UUID] = Field(default=None, description="Client-chosen execution ID (UUID), so updates can be subscribed to before submitting")
 
 class CrewExecutionResponse(BaseModel):
     execution_id: str
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from ..models.schemas import APIKeyRequest, APIKeyResponse, APIProvider
 from ..services.config_service import ConfigService
-from typing import Dict
+from typing import Dict, List
 
 router = APIRouter()
 
@@ -36,6 +36,37 @@ async def store_api_key(
         masked_key=config_service.get_masked_api_key(request.provider)
     )
 
+@router.post("/api-keys/bulk", response_model=List[APIKeyResponse])
+async def store_api_keys(
+    request: Dict[APIProvider, str],
+    config_service: ConfigService = Depends(get_config_service)
+):
+    """Store API keys for several providers in one request"""
+    # Validate every API key format before storing any of them
+    for provider, api_key in request.items():
+        if not config_service.validate_api_key(provider, api_key):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid API key format for {provider}"
+            )
+    
+    # Store API keys
+    success = config_service.store_api_keys(request)
+    if not success:
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to store API keys"
+        )
+    
+    return [
+        APIKeyResponse(
+            provider=provider,
+            is_valid=True,
+            masked_key=config_service.get_masked_api_key(provider)
+        )
+        for provider in request
+    ]
+
 @router.get("/api-keys", response_model=Dict[str, str])
 async def get_api_keys(
     config_service: ConfigService = Depends(get_config_service)
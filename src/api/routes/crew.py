@@ -29,10 +29,19 @@ async def execute_crew(
                 detail="Prompt cannot be empty"
             )
         
+        # A client-chosen execution ID must not replace an existing execution
+        if request.execution_id and crew_service.get_execution_status(str(request.execution_id)):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Execution {request.execution_id} already exists"
+            )
+        
         # Execute crew
         response = await crew_service.execute_crew(request)
         return response
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
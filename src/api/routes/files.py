@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Depends
+from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Query
 from ..models.schemas import FileUploadResponse, FileInfo
 from typing import List
 from datetime import datetime
@@ -10,9 +10,8 @@ router = APIRouter()
 # Temporary storage for uploaded files (in production, use proper storage)
 uploaded_files_store = {}
 
-@router.post("/upload", response_model=FileUploadResponse)
-async def upload_file(file: UploadFile = File(...)):
-    """Upload a document file"""
+async def _read_upload(file: UploadFile) -> bytes:
+    """Validate an uploaded file and return its content"""
     # Validate file type
     allowed_extensions = ['.pdf', '.doc', '.docx', '.txt', '.md']
     file_extension = os.path.splitext(file.filename)[1].lower()
@@ -31,6 +30,10 @@ async def upload_file(file: UploadFile = File(...)):
             detail="File size exceeds 10MB limit"
         )
     
+    return file_content
+
+def _store_upload(file: UploadFile, file_content: bytes) -> FileUploadResponse:
+    """Store validated file content and describe the stored file"""
     # Generate file ID and store
     file_id = str(uuid.uuid4())
     file_info = {
@@ -53,6 +56,23 @@ async def upload_file(file: UploadFile = File(...)):
         uploaded_at=datetime.now().isoformat()
     )
 
+@router.post("/upload", response_model=FileUploadResponse)
+async def upload_file(file: UploadFile = File(...)):
+    """Upload a document file"""
+    file_content = await _read_upload(file)
+    return _store_upload(file, file_content)
+
+@router.post("/upload/batch", response_model=List[FileUploadResponse])
+async def upload_files(files: List[UploadFile] = File(...)):
+    """Upload several document files in one request"""
+    # Validate every file before storing any of them
+    file_contents = [await _read_upload(file) for file in files]
+    
+    return [
+        _store_upload(file, file_content)
+        for file, file_content in zip(files, file_contents)
+    ]
+
 @router.get("/", response_model=List[FileInfo])
 async def get_uploaded_files():
     """Get list of uploaded files"""
@@ -68,6 +88,14 @@ async def get_uploaded_files():
         for info in uploaded_files_store.values()
     ]
 
+@router.delete("/")
+async def delete_files(ids: List[str] = Query(...)):
+    """Delete several uploaded files in one request"""
+    deleted = [file_id for file_id in ids if uploaded_files_store.pop(file_id, None) is not None]
+    not_found = [file_id for file_id in ids if file_id not in deleted]
+    
+    return {"deleted": deleted, "not_found": not_found}
+
 @router.get("/{file_id}", response_model=FileInfo)
 async def get_file_info(file_id: str):
     """Get information about a specific file"""
@@ -157,8 +185,8 @@ async def preview_file(file_id: str):
     }
 
 @router.post("/{file_id}/process")
-async def process_file(file_id: str):
-    """Process a file to extract its content"""
+async def process_file(file_id: str, include_preview: bool = False):
+    """Process a file to extract its content, optionally returning its preview"""
     if file_id not in uploaded_files_store:
         raise HTTPException(
             status_code=404,
@@ -171,12 +199,19 @@ async def process_file(file_id: str):
     try:
         processed_content = await processor.process_file(file_id)
         if processed_content:
-            return {
+            result = {
                 "file_id": file_id,
                 "processed": True,
                 "content_length": len(processed_content["content"]),
                 "metadata": processed_content["metadata"]
             }
+            
+            # Save the client a separate preview request
+            if include_preview:
+                result["preview"] = processor.get_file_preview(processed_content["content"])
+                result["summary"] = processor.get_content_summary(processed_content["content"])
+            
+            return result
         else:
             return {
                 "file_id": file_id,
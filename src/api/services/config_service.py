@@ -34,13 +34,18 @@ class ConfigService:
     
     def store_api_key(self, provider: APIProvider, api_key: str) -> bool:
         """Store encrypted API key"""
+        return self.store_api_keys({provider: api_key})
+    
+    def store_api_keys(self, api_keys_by_provider: Dict[APIProvider, str]) -> bool:
+        """Store several encrypted API keys with a single file write"""
         try:
             # Load existing keys
             api_keys = self._load_encrypted_api_keys()
             
-            # Encrypt and store new key
-            encrypted_key = self._cipher.encrypt(api_key.encode())
-            api_keys[provider.value] = base64.b64encode(encrypted_key).decode()
+            # Encrypt and store new keys
+            for provider, api_key in api_keys_by_provider.items():
+                encrypted_key = self._cipher.encrypt(api_key.encode())
+                api_keys[provider.value] = base64.b64encode(encrypted_key).decode()
             
             # Save to file
             with open(self.api_keys_file, 'w') as f:
@@ -48,7 +53,7 @@ class ConfigService:
             
             return True
         except Exception as e:
-            print(f"Error storing API key for {provider}: {e}")
+            print(f"Error storing API keys: {e}")
             return False
     
     def get_api_key(self, provider: APIProvider) -> Optional[str]:
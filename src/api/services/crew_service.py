@@ -131,7 +131,7 @@ class CrewService:
     
     async def execute_crew(self, request: CrewExecutionRequest) -> CrewExecutionResponse:
         """Execute the requirements decomposition crew"""
-        execution_id = str(uuid.uuid4())
+        execution_id = str(request.execution_id or uuid.uuid4())
         
         # Create execution record
         self.execution_manager.create_execution(execution_id, request)
@@ -349,7 +349,7 @@ class CrewService:
         
         try:
             # Execute crew in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
                 None,
                 lambda: crew_instance.crew().kickoff(inputs=inputs)
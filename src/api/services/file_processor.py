@@ -113,7 +113,7 @@ class FileProcessor:
                 return "\n\n".join(text_parts)
         
         # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, extract_text)
     
     async def _process_pdf_with_pypdf2(self, content: bytes) -> Optional[str]:
@@ -132,7 +132,7 @@ class FileProcessor:
             return "\n\n".join(text_parts)
         
         # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         return await loop.run_in_executor(None, extract_text)
     
     async def _process_text(self, content: bytes, filename: str) -> Optional[str]:
@@ -178,7 +178,7 @@ class FileProcessor:
                 return "\n\n".join(text_parts)
             
             # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             return await loop.run_in_executor(None, extract_text)
             
         except Exception as e:
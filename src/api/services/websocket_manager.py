@@ -8,6 +8,15 @@ import uuid
 
 logger = logging.getLogger(__name__)
 
+def build_execution_update(execution_id: str, update: Dict[str, Any]) -> Dict[str, Any]:
+    """Build an execution update message"""
+    return {
+        "type": "execution_update",
+        "execution_id": execution_id,
+        "timestamp": datetime.now().isoformat(),
+        "data": update
+    }
+
 class WebSocketConnection:
     """Represents a WebSocket connection"""
     
@@ -20,8 +29,12 @@ class WebSocketConnection:
     
     async def send_message(self, message: Dict[str, Any]) -> bool:
         """Send a message to the client"""
+        return await self.send_text(json.dumps(message))
+    
+    async def send_text(self, text: str) -> bool:
+        """Send an already-encoded message to the client"""
         try:
-            await self.websocket.send_text(json.dumps(message))
+            await self.websocket.send_text(text)
             return True
         except Exception as e:
             logger.error(f"Error sending message to client {self.client_id}: {e}")
@@ -30,13 +43,7 @@ class WebSocketConnection:
     
     async def send_execution_update(self, execution_id: str, update: Dict[str, Any]) -> bool:
         """Send an execution update to the client"""
-        message = {
-            "type": "execution_update",
-            "execution_id": execution_id,
-            "timestamp": datetime.now().isoformat(),
-            "data": update
-        }
-        return await self.send_message(message)
+        return await self.send_message(build_execution_update(execution_id, update))
     
     async def send_error(self, error_message: str, execution_id: Optional[str] = None) -> bool:
         """Send an error message to the client"""
@@ -160,11 +167,12 @@ class WebSocketManager:
         # Get all clients subscribed to this execution
         subscriber_ids = list(self.execution_subscribers[execution_id])
         
-        # Send update to each subscriber
+        # Encode the update once and send the same frame to each subscriber
+        text = json.dumps(build_execution_update(execution_id, update))
         for client_id in subscriber_ids:
             if client_id in self.connections:
                 connection = self.connections[client_id]
-                success = await connection.send_execution_update(execution_id, update)
+                success = await connection.send_text(text)
                 
                 if not success:
                     # Connection failed, remove it
@@ -182,9 +190,11 @@ class WebSocketManager:
         """Broadcast a message to all connected clients"""
         client_ids = list(self.connections.keys())
         
+        # Encode the message once for every client
+        text = json.dumps(message)
         for client_id in client_ids:
             connection = self.connections[client_id]
-            success = await connection.send_message(message)
+            success = await connection.send_text(text)
             
             if not success:
                 # Connection failed, remove it
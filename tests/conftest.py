@@ -1,23 +1,53 @@
 import pytest
 import asyncio
 import os
-import tempfile
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Generator
+from typing import Dict, Any, Callable, Generator, Iterable, Tuple
 
 from tests.utils.api_client import APIClient
 from tests.utils.websocket_client import WebSocketTestClient
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows); use asyncio's loop
+    uvloop = None
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; async API calls fall back to worker threads
+    aiohttp = None
+
 # Test configuration
 BASE_URL = "http://localhost:8000"
 WS_URL = "ws://localhost:8000/api/ws"
+SHM_MIN_FREE = 32 * 1024 * 1024  # Free /dev/shm needed before pytest's temp dirs go there
+
+@dataclass(frozen=True, slots=True)
+class TestFiles:
+    """Paths of the generated test files."""
+    __test__ = False  # Not a test class despite the name
+    
+    requirements_md: str
+    test_document_txt: str
+    test_config_json: str
+    
+    def documents(self) -> Dict[str, str]:
+        """Uploadable documents keyed by filename."""
+        return {
+            "requirements.md": self.requirements_md,
+            "test_document.txt": self.test_document_txt
+        }
 
 @pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+def event_loop_policy():
+    """Event loop policy for async tests: uvloop when installed, else asyncio's default."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
 
 @pytest.fixture(scope="session")
 def base_url():
@@ -29,26 +59,118 @@ def ws_url():
     """WebSocket URL for the API server."""
     return WS_URL
 
-@pytest.fixture(scope="function")
-def api_client(base_url) -> APIClient:
-    """Create an API client instance."""
-    return APIClient(base_url)
+@pytest.fixture(scope="session")
+def worker_id() -> str:
+    """pytest-xdist worker name ("master" when not distributed), even without the plugin loaded."""
+    return os.getenv("PYTEST_XDIST_WORKER", "master")
 
-@pytest.fixture(scope="function")
-async def websocket_client(ws_url) -> WebSocketTestClient:
-    """Create a WebSocket client instance."""
+@pytest.fixture(scope="session")
+def api_client(base_url) -> Generator[APIClient, None, None]:
+    """Create an API client instance with a pooled keep-alive session, closed after the session."""
+    with APIClient(base_url) as client:
+        yield client
+
+@pytest.fixture(scope="session")
+def thread_pool() -> Generator[ThreadPoolExecutor, None, None]:
+    """Worker threads shared by every test that fans out blocking API calls."""
+    executor = ThreadPoolExecutor(max_workers=8)
+    yield executor
+    executor.shutdown(wait=True)
+
+@pytest.fixture(scope="session")
+async def http_session():
+    """Pooled aiohttp session for async API calls, or None without aiohttp."""
+    if aiohttp is None:
+        yield None
+        return
+    
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32)) as session:
+        yield session
+
+@pytest.fixture(scope="module")
+async def _module_websocket_client(ws_url) -> WebSocketTestClient:
+    """One WebSocket connection shared by a test module."""
     client = WebSocketTestClient(ws_url)
     await client.connect()
     yield client
     await client.disconnect()
 
+@pytest.fixture(scope="function")
+async def websocket_client(_module_websocket_client) -> WebSocketTestClient:
+    """The module's WebSocket client, with an empty history and no subscriptions left over."""
+    client = _module_websocket_client
+    if not client.connected:
+        await client.connect()
+    client.clear_messages()
+    
+    yield client
+    
+    # Drop this test's subscriptions so the next test starts clean
+    for execution_id in list(client.subscriptions):
+        await client.unsubscribe(execution_id)
+
+def _on_tmpfs(path: str) -> bool:
+    """Whether `path` lives on a RAM-backed tmpfs, judged by its longest /proc/mounts match."""
+    path = os.path.realpath(path)
+    best_mount, best_type = "", ""
+    try:
+        with open("/proc/mounts") as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point, fs_type = fields[1], fields[2]
+                if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) \
+                        and len(mount_point) > len(best_mount):
+                    best_mount, best_type = mount_point, fs_type
+    except OSError:
+        # No /proc (not Linux); only the well-known RAM location is recognised
+        return path.startswith("/dev/shm/")
+    return best_type == "tmpfs"
+
+def _size_file(f, size: int, preallocate: bool = False) -> None:
+    """Grow an open binary file to `size` zero bytes without building them in Python."""
+    # On tmpfs, fallocate would pin `size` bytes of RAM; a sparse file costs nothing
+    if preallocate and hasattr(os, "posix_fallocate") and not _on_tmpfs(f.name):
+        try:
+            # Reserve real extents with a metadata-only operation
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # Not supported by this filesystem; fall through
+    
+    try:
+        # Sparse file: no data is allocated or written
+        os.ftruncate(f.fileno(), size)
+    except OSError:
+        # Filesystem can't extend via truncate; write zeros in 1 MiB chunks
+        chunk = bytes(1024 * 1024)
+        remaining = size
+        while remaining > 0:
+            remaining -= f.write(chunk[:remaining])
+
+def _sized_temp_file(tmp_path_factory, name: str, size: int, preallocate: bool = False) -> str:
+    """Create a .txt file of `size` bytes in pytest's temp directory."""
+    temp_file = tmp_path_factory.mktemp("large_files") / name
+    with open(temp_file, 'wb') as f:
+        _size_file(f, size, preallocate)
+    return str(temp_file)
+
+@pytest.fixture(scope="module")
+def large_1mb_file(tmp_path_factory) -> str:
+    """1MB file, within the upload size limit."""
+    return _sized_temp_file(tmp_path_factory, "large_1mb.txt", 1024 * 1024)
+
+@pytest.fixture(scope="module")
+def oversized_11mb_file(tmp_path_factory) -> str:
+    """11MB file, over the 10MB upload size limit."""
+    return _sized_temp_file(tmp_path_factory, "oversized_11mb.txt", 11 * 1024 * 1024, preallocate=True)
+
 @pytest.fixture(scope="session")
-def test_files() -> Dict[str, str]:
+def test_files(tmp_path_factory) -> TestFiles:
     """Create test files for upload testing."""
-    files = {}
-    
     # Create temporary directory
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = str(tmp_path_factory.mktemp("fixtures"))
     
     # Requirements document
     requirements_content = """# Emergency Communication System Requirements
@@ -120,7 +242,6 @@ The system shall be deployed within 18 months of project initiation.
     requirements_file = os.path.join(temp_dir, "requirements.md")
     with open(requirements_file, "w") as f:
         f.write(requirements_content)
-    files["requirements.md"] = requirements_file
     
     # Simple text file
     text_content = """This is a simple text document for testing file processing.
@@ -130,7 +251,6 @@ The file should be processed correctly by the system."""
     text_file = os.path.join(temp_dir, "test_document.txt")
     with open(text_file, "w") as f:
         f.write(text_content)
-    files["test_document.txt"] = text_file
     
     # Test configuration
     config_content = {
@@ -159,17 +279,130 @@ The file should be processed correctly by the system."""
     config_file = os.path.join(temp_dir, "test_config.json")
     with open(config_file, "w") as f:
         json.dump(config_content, f, indent=2)
-    files["test_config.json"] = config_file
     
-    return files
+    return TestFiles(
+        requirements_md=requirements_file,
+        test_document_txt=text_file,
+        test_config_json=config_file
+    )
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_config(test_files) -> Dict[str, Any]:
-    """Load test configuration."""
+    """Load test configuration once per session (shared; tests must not mutate it)."""
     import json
-    with open(test_files["test_config.json"]) as f:
+    with open(test_files.test_config_json) as f:
         return json.load(f)
 
+@pytest.fixture(scope="session")
+def make_execution_request(test_config) -> Callable[..., Dict[str, Any]]:
+    """Build crew execution requests that use the test agent configs."""
+    agent_configs = test_config["test_agent_configs"]
+    
+    def _make(prompt: str, uploaded_files: Iterable[str] = ()) -> Dict[str, Any]:
+        return {
+            "prompt": prompt,
+            "uploaded_files": list(uploaded_files),
+            "agent_configs": agent_configs,
+            "execution_mode": "run"
+        }
+    
+    return _make
+
+@pytest.fixture(scope="module")
+async def module_test_api_keys(api_client, test_config, http_session) -> None:
+    """Store the test API keys once per module."""
+    await api_client.setup_test_api_keys_async(test_config, session=http_session)
+
+@pytest.fixture
+async def started_execution(request, api_client, websocket_client, make_execution_request,
+                            module_test_api_keys, http_session) -> Tuple[str, WebSocketTestClient]:
+    """Start an execution for the parametrized prompt, already subscribed on websocket_client.
+    
+    The execution ID is chosen client-side so the subscription is in place
+    before the execution starts. The execution is cancelled on teardown.
+    """
+    prompt = getattr(request, "param", "Test WebSocket execution")
+    execution_id = str(uuid.uuid4())
+    
+    # 1. Subscribe before the execution exists so no early update is missed
+    await websocket_client.subscribe(execution_id)
+    await websocket_client.wait_for_message(
+        "system",
+        predicate=lambda msg: f"Subscribed to execution {execution_id}" in msg.get("message", ""),
+        timeout=5.0
+    )
+    
+    # 2. Start the execution under that ID
+    execution_request = {**make_execution_request(prompt), "execution_id": execution_id}
+    await api_client.execute_crew_async(execution_request, session=http_session)
+    
+    yield execution_id, websocket_client
+    
+    # Cancel execution for cleanup; it may already have finished
+    try:
+        await api_client.cancel_execution_async(execution_id, session=http_session)
+    except Exception:
+        pass
+
+def _upload_for_session(client: APIClient, file_path: str) -> Generator[Dict[str, Any], None, None]:
+    """Upload a file once, yield the upload response and delete it afterwards."""
+    upload_response = client.upload_file(file_path)
+    
+    yield upload_response
+    
+    # Cleanup
+    try:
+        client.delete_file(upload_response["file_id"])
+    except Exception:
+        pass  # Ignore cleanup errors
+
+@pytest.fixture(scope="session")
+def uploaded_requirements_md(api_client, test_files) -> Generator[Dict[str, Any], None, None]:
+    """Upload the requirements document once for read-only tests."""
+    yield from _upload_for_session(api_client, test_files.requirements_md)
+
+@pytest.fixture(scope="session")
+def uploaded_test_document_txt(api_client, test_files) -> Generator[Dict[str, Any], None, None]:
+    """Upload the text document once for read-only tests."""
+    yield from _upload_for_session(api_client, test_files.test_document_txt)
+
+@pytest.fixture(scope="session")
+def uploaded_test_files(api_client, test_files) -> Generator[Dict[str, str], None, None]:
+    """Upload the test documents once in one batch and yield their file IDs by name."""
+    file_ids = api_client.upload_files_batch(test_files.documents())
+    
+    yield file_ids
+    
+    # Cleanup
+    api_client.delete_files(list(file_ids.values()))
+
+@pytest.fixture(scope="session")
+def previewed_requirements(api_client, uploaded_requirements_md) -> Dict[str, Any]:
+    """Preview of the session-wide requirements document, fetched once."""
+    return api_client.preview_file_cached(uploaded_requirements_md["file_id"])
+
+@pytest.fixture(scope="session")
+def previewed_test_document(api_client, uploaded_test_document_txt) -> Dict[str, Any]:
+    """Preview of the session-wide text document, fetched once."""
+    return api_client.preview_file_cached(uploaded_test_document_txt["file_id"])
+
+# Session fixtures holding the upload response and cached preview of each document
+_DOCUMENT_FIXTURES = {
+    "requirements.md": ("uploaded_requirements_md", "previewed_requirements"),
+    "test_document.txt": ("uploaded_test_document_txt", "previewed_test_document")
+}
+
+@pytest.fixture(scope="function")
+def previewed_document(request) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Upload response and cached preview of the document named by the indirect parameter."""
+    upload_fixture, preview_fixture = _DOCUMENT_FIXTURES[request.param]
+    return request.getfixturevalue(upload_fixture), request.getfixturevalue(preview_fixture)
+
+@pytest.fixture(scope="session")
+def shared_requirements_file_id(uploaded_requirements_md) -> str:
+    """File ID of the session-wide uploaded requirements document."""
+    return uploaded_requirements_md["file_id"]
+
 @pytest.fixture(scope="function")
 def cleanup_uploaded_files(api_client):
     """Clean up uploaded files after tests."""
@@ -181,11 +414,10 @@ def cleanup_uploaded_files(api_client):
     yield track_file
     
     # Cleanup
-    for file_id in uploaded_files:
-        try:
-            api_client.delete_file(file_id)
-        except Exception:
-            pass  # Ignore cleanup errors
+    try:
+        api_client.delete_files(uploaded_files)
+    except Exception:
+        pass  # Ignore cleanup errors
 
 @pytest.fixture(scope="function")
 def cleanup_executions(api_client):
@@ -207,10 +439,20 @@ def cleanup_executions(api_client):
 # Test markers
 def pytest_configure(config):
     """Configure pytest markers."""
+    # Keep pytest's own temp dirs (tmp_path and friends) in RAM on Linux, without touching
+    # tempfile for the rest of the process. Containers often cap /dev/shm at 64 MB, so only
+    # use it with room to spare; xdist workers inherit the controller's basetemp.
+    if (not config.option.basetemp and not os.getenv("TMPDIR")
+            and not os.getenv("PYTEST_XDIST_WORKER") and os.access("/dev/shm", os.W_OK)
+            and shutil.disk_usage("/dev/shm").free >= SHM_MIN_FREE):
+        config.option.basetemp = f"/dev/shm/pytest-of-{os.getuid()}"
+    
     config.addinivalue_line("markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')")
     config.addinivalue_line("markers", "integration: marks tests as integration tests")
+    config.addinivalue_line("markers", "unit: marks tests that are answered client-side without a server round-trip")
     config.addinivalue_line("markers", "websocket: marks tests as websocket tests")
     config.addinivalue_line("markers", "requires_api_key: marks tests that require real API keys")
+    config.addinivalue_line("markers", "xdist_group: pins tests that share server state to one pytest-xdist worker")
 
 # Skip tests that require real API keys unless explicitly enabled
 def pytest_runtest_setup(item):
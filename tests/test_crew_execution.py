@@ -1,8 +1,22 @@
 import pytest
 import time
+import uuid
 import requests
+from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter
 from tests.utils.api_client import APIClient
 
+# Execution status schema, compiled once at import
+class ExecutionStatus(BaseModel):
+    execution_id: str
+    status: str
+    progress: float = Field(ge=0.0, le=1.0)
+    current_agent: Optional[str]
+    current_task: Optional[str]
+    output: Optional[str]
+
+_EXECUTION_STATUS = TypeAdapter(ExecutionStatus)
+
 class TestCrewExecutionBasic:
     """Test basic crew execution functionality."""
     
@@ -60,16 +74,75 @@ class TestCrewExecutionBasic:
         with pytest.raises(requests.exceptions.HTTPError) as exc_info:
             api_client.execute_crew(execution_request)
         
-        assert exc_info.value.response.status_code == 400
-        assert "empty" in exc_info.value.response.json()["detail"]
+        assert exc_info.value.response.status_code == 422
+        assert "at least 10 characters" in exc_info.value.response.json()["detail"]
+    
+    @pytest.mark.integration
+    def test_crew_execution_invalid_request_server_side(self, api_client: APIClient):
+        """Test that the server itself rejects an empty prompt."""
+        execution_request = {
+            "prompt": "",
+            "uploaded_files": [],
+            "agent_configs": {
+                "requirements_analyst": {
+                    "provider": "openai",
+                    "model": "gpt-4o-mini",
+                    "temperature": 0.1,
+                    "max_tokens": 2000
+                }
+            },
+            "execution_mode": "run"
+        }
+        
+        # Bypass the client-side check so the request reaches the server
+        response = api_client._make_request('POST', '/api/crew/execute', json=execution_request)
+        
+        assert response.status_code == 422
     
-    def test_crew_execution_with_files(self, api_client: APIClient, test_files, test_config, cleanup_executions, cleanup_uploaded_files):
+    def test_crew_execution_duplicate_execution_id(self, api_client: APIClient, test_config, cleanup_executions):
+        """Test that a client-chosen execution ID cannot be reused."""
+        api_client.setup_test_api_keys(test_config)
+        
+        execution_id = str(uuid.uuid4())
+        execution_request = {
+            "prompt": "Test duplicate execution ID",
+            "uploaded_files": [],
+            "agent_configs": test_config["test_agent_configs"],
+            "execution_mode": "run",
+            "execution_id": execution_id
+        }
+        
+        # First submission is accepted under the chosen ID
+        response = api_client.execute_crew(execution_request)
+        cleanup_executions(execution_id)
+        assert response["execution_id"] == execution_id
+        
+        # Second submission with the same ID is rejected
+        with pytest.raises(requests.exceptions.HTTPError) as exc_info:
+            api_client.execute_crew(execution_request)
+        
+        assert exc_info.value.response.status_code == 409
+        assert "already exists" in exc_info.value.response.json()["detail"]
+    
+    def test_crew_execution_invalid_execution_id(self, api_client: APIClient, test_config):
+        """Test that a client-chosen execution ID must be a UUID."""
+        execution_request = {
+            "prompt": "Test invalid execution ID",
+            "uploaded_files": [],
+            "agent_configs": test_config["test_agent_configs"],
+            "execution_mode": "run",
+            "execution_id": "../not-a-uuid"
+        }
+        
+        with pytest.raises(requests.exceptions.HTTPError) as exc_info:
+            api_client.execute_crew(execution_request)
+        
+        assert exc_info.value.response.status_code == 422
+    
+    def test_crew_execution_with_files(self, api_client: APIClient, shared_requirements_file_id, test_config, cleanup_executions):
         """Test crew execution with uploaded files."""
-        # Upload a file first
-        file_path = test_files["requirements.md"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
+        # Reuse the session-wide uploaded requirements document
+        file_id = shared_requirements_file_id
         
         # Set up test API keys
         api_client.setup_test_api_keys(test_config)
@@ -122,15 +195,11 @@ class TestExecutionStatus:
         # Get initial status
         status = api_client.get_execution_status(execution_id)
         
+        # Check field presence, types and progress bounds in one pass
+        _EXECUTION_STATUS.validate_python(status)
+        
         assert status["execution_id"] == execution_id
         assert status["status"] in ["pending", "running", "failed"]
-        assert "progress" in status
-        assert 0.0 <= status["progress"] <= 1.0
-        
-        # Check for presence of other fields
-        assert "current_agent" in status
-        assert "current_task" in status
-        assert "output" in status
     
     def test_get_nonexistent_execution_status(self, api_client: APIClient):
         """Test getting status for non-existent execution."""
@@ -245,7 +314,7 @@ class TestExecutionCancellation:
         assert status["status"] == "cancelled"
         assert status["completed_at"] is not None
     
-    def test_cancel_completed_execution(self, api_client: APIClient, test_config, cleanup_executions):
+    async def test_cancel_completed_execution(self, api_client: APIClient, test_config, cleanup_executions):
         """Test cancelling a completed execution."""
         # Set up test API keys
         api_client.setup_test_api_keys(test_config)
@@ -263,7 +332,7 @@ class TestExecutionCancellation:
         cleanup_executions(execution_id)
         
         # Wait for completion (should fail with test keys)
-        final_status = api_client.wait_for_execution(execution_id, timeout=10)
+        final_status = await api_client.wait_for_execution_async(execution_id, timeout=10)
         assert final_status["status"] in ["completed", "failed"]
         
         # Try to cancel completed execution
@@ -363,7 +432,7 @@ class TestExecutionWithDifferentConfigs:
 class TestExecutionWithRealKeys:
     """Test execution with real API keys (only run if explicitly enabled)."""
     
-    def test_successful_execution_with_real_keys(self, api_client: APIClient, cleanup_executions):
+    async def test_successful_execution_with_real_keys(self, api_client: APIClient, cleanup_executions):
         """Test successful execution with real API keys."""
         # This test only runs if ENABLE_API_KEY_TESTS=1 is set
         import os
@@ -395,7 +464,7 @@ class TestExecutionWithRealKeys:
         cleanup_executions(execution_id)
         
         # Wait for completion
-        final_status = api_client.wait_for_execution(execution_id, timeout=60)
+        final_status = await api_client.wait_for_execution_async(execution_id, timeout=60)
         
         # Should complete successfully
         assert final_status["status"] == "completed"
@@ -406,7 +475,7 @@ class TestExecutionWithRealKeys:
 class TestExecutionErrorHandling:
     """Test error handling in crew execution."""
     
-    def test_execution_with_missing_api_key(self, api_client: APIClient, cleanup_executions):
+    async def test_execution_with_missing_api_key(self, api_client: APIClient, cleanup_executions):
         """Test execution without API key."""
         execution_request = {
             "prompt": "Test without API key",
@@ -427,7 +496,7 @@ class TestExecutionErrorHandling:
         cleanup_executions(execution_id)
         
         # Should fail due to missing API key
-        final_status = api_client.wait_for_execution(execution_id, timeout=10)
+        final_status = await api_client.wait_for_execution_async(execution_id, timeout=10)
         assert final_status["status"] == "failed"
         assert "API key" in final_status["error"] or "key" in final_status["error"]
     
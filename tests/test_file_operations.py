@@ -1,15 +1,24 @@
 import pytest
-import os
-import tempfile
+import re
 import requests
 from tests.utils.api_client import APIClient
 
+# Upload error detail patterns
+_EXT_ERR = re.compile(r"not supported")
+_SIZE_ERR = re.compile(r"exceeds")
+
+# Keywords expected in extracted content, each scanned for in a single pass
+_MD_KEYWORDS = ("FR-001", "NFR-001", "Real-time Communication", "Performance")
+_MD_KEYWORDS_RE = re.compile("|".join(map(re.escape, _MD_KEYWORDS)))
+_TXT_KEYWORDS = ("simple text document", "file processing", "multiple lines")
+_TXT_KEYWORDS_RE = re.compile("|".join(map(re.escape, _TXT_KEYWORDS)))
+
 class TestFileUpload:
     """Test file upload functionality."""
     
     def test_upload_markdown_file(self, api_client: APIClient, test_files, cleanup_uploaded_files):
         """Test uploading a markdown file."""
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         
         response = api_client.upload_file(file_path)
         cleanup_uploaded_files(response["file_id"])
@@ -22,7 +31,7 @@ class TestFileUpload:
     
     def test_upload_text_file(self, api_client: APIClient, test_files, cleanup_uploaded_files):
         """Test uploading a text file."""
-        file_path = test_files["test_document.txt"]
+        file_path = test_files.test_document_txt
         
         response = api_client.upload_file(file_path)
         cleanup_uploaded_files(response["file_id"])
@@ -34,7 +43,7 @@ class TestFileUpload:
     
     def test_upload_with_custom_filename(self, api_client: APIClient, test_files, cleanup_uploaded_files):
         """Test uploading file with custom filename."""
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         custom_filename = "custom_requirements.md"
         
         response = api_client.upload_file(file_path, custom_filename)
@@ -42,59 +51,56 @@ class TestFileUpload:
         
         assert response["filename"] == custom_filename
     
-    def test_upload_large_file(self, api_client: APIClient, cleanup_uploaded_files):
+    def test_upload_large_file(self, api_client: APIClient, large_1mb_file, cleanup_uploaded_files):
         """Test uploading a large file (within limits)."""
-        # Create a temporary large file (1MB)
-        large_content = "x" * (1024 * 1024)  # 1MB
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(large_content)
-            temp_file = f.name
-        
-        try:
-            response = api_client.upload_file(temp_file)
-            cleanup_uploaded_files(response["file_id"])
-            
-            assert response["size"] == 1024 * 1024
-            assert "file_id" in response
-        finally:
-            os.unlink(temp_file)
+        response = api_client.upload_file(large_1mb_file)
+        cleanup_uploaded_files(response["file_id"])
+        
+        assert response["size"] == 1024 * 1024
+        assert "file_id" in response
     
-    def test_upload_unsupported_file_type(self, api_client: APIClient):
-        """Test uploading unsupported file type."""
+    @pytest.mark.unit
+    @pytest.mark.parametrize("suffix,pattern", [
+        (".xyz", _EXT_ERR),
+        (".exe", _EXT_ERR),
+        (".json", _EXT_ERR),
+        ("", _EXT_ERR),
+    ])
+    def test_upload_unsupported_file_type(self, api_client: APIClient, tmp_path, suffix, pattern):
+        """Test uploading unsupported file type (rejected client-side)."""
         # Create a temporary file with unsupported extension
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.xyz', delete=False) as f:
-            f.write("test content")
-            temp_file = f.name
-        
-        try:
-            with pytest.raises(requests.exceptions.HTTPError) as exc_info:
-                api_client.upload_file(temp_file)
-            
-            assert exc_info.value.response.status_code == 400
-            error_response = exc_info.value.response.json()
-            assert "not supported" in error_response["detail"]
-        finally:
-            os.unlink(temp_file)
+        temp_file = tmp_path / f"bad{suffix}"
+        temp_file.write_bytes(b"test content")
+        
+        with pytest.raises(requests.exceptions.HTTPError) as exc_info:
+            api_client.upload_file(str(temp_file))
+        
+        assert exc_info.value.response.status_code == 400
+        error_response = exc_info.value.response.json()
+        assert pattern.search(error_response["detail"])
     
-    def test_upload_oversized_file(self, api_client: APIClient):
+    @pytest.mark.integration
+    def test_upload_unsupported_file_type_server_side(self, api_client: APIClient, tmp_path):
+        """Test that the server itself rejects an unsupported file type."""
+        # Create a temporary file with unsupported extension
+        temp_file = tmp_path / "bad.xyz"
+        temp_file.write_bytes(b"test content")
+        
+        with pytest.raises(requests.exceptions.HTTPError) as exc_info:
+            api_client.upload_file(str(temp_file), validate_extension=False)
+        
+        assert exc_info.value.response.status_code == 400
+        error_response = exc_info.value.response.json()
+        assert _EXT_ERR.search(error_response["detail"])
+    
+    def test_upload_oversized_file(self, api_client: APIClient, oversized_11mb_file):
         """Test uploading file that exceeds size limit."""
-        # Create a temporary file that exceeds 10MB limit
-        oversized_content = "x" * (11 * 1024 * 1024)  # 11MB
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(oversized_content)
-            temp_file = f.name
-        
-        try:
-            with pytest.raises(requests.exceptions.HTTPError) as exc_info:
-                api_client.upload_file(temp_file)
-            
-            assert exc_info.value.response.status_code == 400
-            error_response = exc_info.value.response.json()
-            assert "exceeds" in error_response["detail"]
-        finally:
-            os.unlink(temp_file)
+        with pytest.raises(requests.exceptions.HTTPError) as exc_info:
+            api_client.upload_file(oversized_11mb_file)
+        
+        assert exc_info.value.response.status_code == 400
+        error_response = exc_info.value.response.json()
+        assert _SIZE_ERR.search(error_response["detail"])
     
     def test_upload_nonexistent_file(self, api_client: APIClient):
         """Test uploading non-existent file."""
@@ -107,7 +113,7 @@ class TestFileOperations:
     def test_get_uploaded_files(self, api_client: APIClient, test_files, cleanup_uploaded_files):
         """Test getting list of uploaded files."""
         # Upload a file first
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         upload_response = api_client.upload_file(file_path)
         cleanup_uploaded_files(upload_response["file_id"])
         
@@ -126,7 +132,7 @@ class TestFileOperations:
     def test_get_file_info(self, api_client: APIClient, test_files, cleanup_uploaded_files):
         """Test getting specific file information."""
         # Upload a file first
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         upload_response = api_client.upload_file(file_path)
         file_id = upload_response["file_id"]
         cleanup_uploaded_files(file_id)
@@ -150,7 +156,7 @@ class TestFileOperations:
     def test_delete_file(self, api_client: APIClient, test_files):
         """Test deleting a file."""
         # Upload a file first
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         upload_response = api_client.upload_file(file_path)
         file_id = upload_response["file_id"]
         
@@ -174,51 +180,29 @@ class TestFileOperations:
 class TestFileProcessing:
     """Test file content processing."""
     
-    def test_preview_markdown_file(self, api_client: APIClient, test_files, cleanup_uploaded_files):
-        """Test previewing markdown file content."""
-        # Upload a file first
-        file_path = test_files["requirements.md"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
-        
-        # Get file preview
-        preview = api_client.preview_file(file_id)
-        
-        assert preview["file_id"] == file_id
-        assert preview["filename"] == "requirements.md"
+    @pytest.mark.parametrize("previewed_document,needle", [
+        ("requirements.md", "Emergency Communication System"),
+        ("test_document.txt", "simple text document"),
+    ], indirect=["previewed_document"])
+    def test_preview_file(self, previewed_document, needle):
+        """Test previewing markdown and text file content."""
+        upload_response, preview = previewed_document
+        
+        assert preview["file_id"] == upload_response["file_id"]
+        assert preview["filename"] == upload_response["filename"]
         assert preview["processed"] is True
         assert "preview" in preview
         assert "summary" in preview
         
         # Check that content was extracted
-        assert "Emergency Communication System" in preview["preview"]
+        assert needle in preview["preview"]
         assert preview["summary"]["character_count"] > 0
         assert preview["summary"]["word_count"] > 0
     
-    def test_preview_text_file(self, api_client: APIClient, test_files, cleanup_uploaded_files):
-        """Test previewing text file content."""
-        # Upload a file first
-        file_path = test_files["test_document.txt"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
-        
-        # Get file preview
-        preview = api_client.preview_file(file_id)
-        
-        assert preview["file_id"] == file_id
-        assert preview["filename"] == "test_document.txt"
-        assert preview["processed"] is True
-        assert "simple text document" in preview["preview"]
-    
-    def test_process_file_explicitly(self, api_client: APIClient, test_files, cleanup_uploaded_files):
+    def test_process_file_explicitly(self, api_client: APIClient, uploaded_requirements_md):
         """Test explicit file processing."""
-        # Upload a file first
-        file_path = test_files["requirements.md"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
+        # Reuse the session-wide upload
+        file_id = uploaded_requirements_md["file_id"]
         
         # Process the file
         process_response = api_client.process_file(file_id)
@@ -252,134 +236,101 @@ class TestFileProcessing:
 class TestFileContentValidation:
     """Test file content validation and extraction."""
     
-    def test_markdown_content_extraction(self, api_client: APIClient, test_files, cleanup_uploaded_files):
+    def test_markdown_content_extraction(self, previewed_requirements):
         """Test that markdown content is properly extracted."""
-        # Upload requirements document
-        file_path = test_files["requirements.md"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
-        
-        # Get preview
-        preview = api_client.preview_file(file_id)
-        content = preview["preview"]
+        content = previewed_requirements["preview"]
         
         # Check that specific requirements are extracted
-        assert "FR-001" in content
-        assert "NFR-001" in content
-        assert "Real-time Communication" in content
-        assert "Performance" in content
+        found = set(_MD_KEYWORDS_RE.findall(content))
+        assert found.issuperset(_MD_KEYWORDS), f"Missing: {set(_MD_KEYWORDS) - found}"
+    
+    def test_markdown_summary_statistics(self, previewed_requirements):
+        """Test the summary statistics of the markdown preview."""
+        summary = previewed_requirements["summary"]
         
-        # Check summary statistics
-        summary = preview["summary"]
         assert summary["character_count"] > 1000
         assert summary["word_count"] > 100
         assert summary["line_count"] > 10
     
-    def test_text_content_extraction(self, api_client: APIClient, test_files, cleanup_uploaded_files):
+    def test_text_content_extraction(self, previewed_test_document):
         """Test that text content is properly extracted."""
-        # Upload text document
-        file_path = test_files["test_document.txt"]
-        upload_response = api_client.upload_file(file_path)
-        file_id = upload_response["file_id"]
-        cleanup_uploaded_files(file_id)
-        
-        # Get preview
-        preview = api_client.preview_file(file_id)
-        content = preview["preview"]
+        content = previewed_test_document["preview"]
         
         # Check that content is extracted
-        assert "simple text document" in content
-        assert "file processing" in content
-        assert "multiple lines" in content
+        found = set(_TXT_KEYWORDS_RE.findall(content))
+        assert found.issuperset(_TXT_KEYWORDS), f"Missing: {set(_TXT_KEYWORDS) - found}"
     
-    def test_empty_file_handling(self, api_client: APIClient, cleanup_uploaded_files):
+    def test_empty_file_handling(self, api_client: APIClient, cleanup_uploaded_files, tmp_path):
         """Test handling of empty files."""
         # Create empty file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            temp_file = f.name
-        
-        try:
-            # Upload empty file
-            upload_response = api_client.upload_file(temp_file)
-            file_id = upload_response["file_id"]
-            cleanup_uploaded_files(file_id)
-            
-            assert upload_response["size"] == 0
-            
-            # Try to preview empty file
-            preview = api_client.preview_file(file_id)
-            assert preview["summary"]["character_count"] == 0
-            assert preview["summary"]["word_count"] == 0
-            
-        finally:
-            os.unlink(temp_file)
+        temp_file = tmp_path / "empty.txt"
+        temp_file.touch()
+        
+        # Upload empty file
+        upload_response = api_client.upload_file(str(temp_file))
+        file_id = upload_response["file_id"]
+        cleanup_uploaded_files(file_id)
+        
+        assert upload_response["size"] == 0
+        
+        # Try to preview empty file
+        preview = api_client.preview_file(file_id)
+        assert preview["summary"]["character_count"] == 0
+        assert preview["summary"]["word_count"] == 0
 
+@pytest.mark.xdist_group(name="workflow")
 class TestFileWorkflow:
     """Test complete file workflow."""
     
-    def test_upload_process_preview_delete_workflow(self, api_client: APIClient, test_files):
+    def test_upload_process_preview_delete_workflow(self, api_client: APIClient, test_files, thread_pool):
         """Test complete file workflow."""
         # 1. Upload file
-        file_path = test_files["requirements.md"]
+        file_path = test_files.requirements_md
         upload_response = api_client.upload_file(file_path)
         file_id = upload_response["file_id"]
         
         assert "file_id" in upload_response
         assert upload_response["filename"] == "requirements.md"
         
-        # 2. Verify it appears in file list
-        files = api_client.get_files()
-        uploaded_file = next((f for f in files if f["file_id"] == file_id), None)
-        assert uploaded_file is not None
+        # 2-3. Get file info while the file is processed
+        info_future = thread_pool.submit(api_client.get_file_info, file_id)
+        process_future = thread_pool.submit(api_client.process_file, file_id)
         
-        # 3. Get file info
-        file_info = api_client.get_file_info(file_id)
+        # 2. Verify it exists (single lookup; the list endpoint has its own test)
+        file_info = info_future.result()
         assert file_info["file_id"] == file_id
         
-        # 4. Process file
-        process_response = api_client.process_file(file_id)
+        # 3. Process file
+        process_response = process_future.result()
         assert process_response["processed"] is True
         
-        # 5. Preview file content
+        # 4. Preview the stored processed content, only once processing is done
         preview = api_client.preview_file(file_id)
         assert preview["processed"] is True
         assert len(preview["preview"]) > 0
         
-        # 6. Delete file
+        # 5. Delete file
         delete_response = api_client.delete_file(file_id)
         assert "deleted successfully" in delete_response["message"]
         
-        # 7. Verify it's gone
+        # 6. Verify it's gone
         with pytest.raises(requests.exceptions.HTTPError):
             api_client.get_file_info(file_id)
     
-    def test_multiple_file_upload(self, api_client: APIClient, test_files):
+    def test_multiple_file_upload(self, api_client: APIClient, test_files, thread_pool, request):
         """Test uploading multiple files."""
+        file_paths = [test_files.requirements_md, test_files.test_document_txt]
         file_ids = []
+        request.addfinalizer(lambda: api_client.delete_files(file_ids))
+        
+        # Upload multiple files concurrently
+        upload_responses = list(thread_pool.map(api_client.upload_file, file_paths))
+        file_ids.extend(response["file_id"] for response in upload_responses)
+        
+        # Verify all files are listed
+        uploaded_files = [f for f in api_client.iter_files() if f["file_id"] in file_ids]
+        assert len(uploaded_files) == len(file_ids)
         
-        try:
-            # Upload multiple files
-            for filename in ["requirements.md", "test_document.txt"]:
-                if filename in test_files:
-                    file_path = test_files[filename]
-                    upload_response = api_client.upload_file(file_path)
-                    file_ids.append(upload_response["file_id"])
-            
-            # Verify all files are listed
-            files = api_client.get_files()
-            uploaded_files = [f for f in files if f["file_id"] in file_ids]
-            assert len(uploaded_files) == len(file_ids)
-            
-            # Process all files
-            for file_id in file_ids:
-                process_response = api_client.process_file(file_id)
-                assert process_response["processed"] is True
-            
-        finally:
-            # Cleanup
-            for file_id in file_ids:
-                try:
-                    api_client.delete_file(file_id)
-                except:
-                    pass
\ No newline at end of file
+        # Process all files concurrently
+        for process_response in thread_pool.map(api_client.process_file, file_ids):
+            assert process_response["processed"] is True
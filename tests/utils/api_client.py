@@ -1,86 +1,283 @@
 import requests
-import json
-from typing import Dict, Any, Optional, List
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from http import HTTPStatus
+from typing import Dict, Any, Optional, List, Iterable, Iterator
+from contextlib import ExitStack
+from functools import partial
+import asyncio
+import logging
+import os
 import time
+import uuid
+
+from tests.utils.websocket_client import WebSocketTestClient
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    import json as orjson
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; fall back to full-body parsing
+    ijson = None
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; async calls fall back to worker threads
+    aiohttp = None
+
+def _iter_multipart(field: str, filename: str, fileobj, content_type: str,
+                    boundary: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield a single-file multipart/form-data body, reading the file in chunks."""
+    quoted_filename = filename.replace('"', '%22')
+    yield (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{quoted_filename}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'
+    ).encode()
+    
+    while chunk := fileobj.read(chunk_size):
+        yield chunk
+    
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+logger = logging.getLogger(__name__)
 
 class APIClient:
     """HTTP client for testing the CrewAI Requirements API."""
     
-    def __init__(self, base_url: str):
+    # Upload extensions accepted by the server, in the order it reports them
+    _ALLOWED_EXTENSIONS = ('.pdf', '.doc', '.docx', '.txt', '.md')
+    _ALLOWED_EXT = frozenset(_ALLOWED_EXTENSIONS)
+    
+    # Part content types for uploads, looked up by extension
+    _UPLOAD_CONTENT_TYPES = {
+        '.pdf': 'application/pdf',
+        '.doc': 'application/msword',
+        '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        '.txt': 'text/plain',
+        '.md': 'text/markdown'
+    }
+    
+    # Execution states that will not change any more
+    _TERMINAL_STATUSES = frozenset(('completed', 'failed', 'cancelled'))
+    
+    # Same bound as CrewExecutionRequest.prompt (min_length=10)
+    _MIN_PROMPT_LENGTH = 10
+    
+    # Per-request headers, built once and shared by every call
+    _JSON_HEADERS = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+    _ACCEPT_JSON_HEADERS = {'Accept': 'application/json'}
+    _MULTIPART_HEADERS = {'Content-Type': None}
+    
+    def __init__(self, base_url: str, timeout: float = 30.0, ws_url: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
+        self.ws_url = ws_url or f"{self.base_url.replace('http', 'ws', 1)}/api/ws"
+        self.timeout = timeout
+        self._upload_url = f"{self.base_url}/api/files/upload"
+        self._preview_cache: Dict[str, Dict[str, Any]] = {}
+        self._static_cache: Dict[str, Any] = {}
         self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        self.session.headers.update(self._JSON_HEADERS)
+        
+        # Keep connections alive and pooled across every request. Retry failed
+        # connection attempts, which never reached the server, and idempotent
+        # requests answered with a transient gateway error; never replay a POST
+        retry = Retry(
+            total=2,
+            connect=2,
+            read=0,
+            status=2,
+            redirect=0,
+            backoff_factor=0.05,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(('GET', 'HEAD', 'DELETE')),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Session.get/post/delete only forward to Session.request, so bind that once
+        self._request = self.session.request
+    
+    def close(self) -> None:
+        """Close the underlying session and its connection pools."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Make HTTP request with error handling."""
-        url = f"{self.base_url}{endpoint}"
+        return self._send(method, f"{self.base_url}{endpoint}", **kwargs)
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send HTTP request to an already-resolved URL."""
+        # Encode JSON bodies ourselves so orjson is used when available
+        payload = kwargs.pop('json', None)
+        if payload is not None:
+            kwargs['data'] = orjson.dumps(payload)
+        kwargs.setdefault('timeout', self.timeout)
         
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = self._request(method, url, **kwargs)
             return response
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {e}")
     
+    def _client_error(self, endpoint: str, status_code: int, detail: str) -> requests.exceptions.HTTPError:
+        """Build the HTTPError the server would return, without a round-trip."""
+        body = orjson.dumps({"detail": detail})
+        
+        response = requests.Response()
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.url = f"{self.base_url}{endpoint}"
+        response.headers['Content-Type'] = 'application/json'
+        response._content = body if isinstance(body, bytes) else body.encode()
+        
+        return requests.exceptions.HTTPError(
+            f"{status_code} Client Error: {response.reason} for url: {response.url}",
+            response=response
+        )
+    
+    def _call(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Make HTTP request, raise on error status and return the decoded JSON body."""
+        response = self._make_request(method, endpoint, **kwargs)
+        response.raise_for_status()
+        return self._get_json(response)
+    
     def _get_json(self, response: requests.Response) -> Dict[str, Any]:
         """Extract JSON from response with error handling."""
         try:
-            return response.json()
-        except json.JSONDecodeError:
+            return orjson.loads(response.content)
+        except ValueError:
             raise Exception(f"Invalid JSON response: {response.text}")
     
+    def _iter_json_array(self, endpoint: str) -> Iterator[Any]:
+        """GET an endpoint returning a JSON array and yield its items.
+        
+        With ijson installed the body is stream-parsed, so items are yielded as
+        they arrive and the download stops if the caller stops iterating.
+        """
+        response = self._make_request('GET', endpoint, stream=ijson is not None)
+        try:
+            response.raise_for_status()
+            if ijson is None:
+                yield from self._get_json(response)
+                return
+            
+            response.raw.decode_content = True
+            yield from ijson.items(response.raw, 'item')
+        finally:
+            response.close()
+    
+    async def _request_json_async(self, method: str, endpoint: str,
+                                  session: Optional["aiohttp.ClientSession"] = None,
+                                  json: Any = None) -> Any:
+        """Send a JSON request without blocking the event loop.
+        
+        Uses the given aiohttp ``session`` when there is one, otherwise sends
+        the request through the sync session in the loop's default executor.
+        """
+        if session is None:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, partial(self._call, method, endpoint, json=json)
+            )
+        
+        async with session.request(
+            method,
+            f"{self.base_url}{endpoint}",
+            data=None if json is None else orjson.dumps(json),
+            headers=self._JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        ) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())
+    
+    def _get_static_json(self, endpoint: str) -> Any:
+        """GET an endpoint whose response is fixed for the server's lifetime, once per client."""
+        if endpoint not in self._static_cache:
+            self._static_cache[endpoint] = self._call('GET', endpoint)
+        return self._static_cache[endpoint]
+    
     # Health and info endpoints
     def health_check(self) -> Dict[str, Any]:
         """Check API health."""
-        response = self._make_request('GET', '/health')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/health')
     
     def get_openapi_spec(self) -> Dict[str, Any]:
         """Get OpenAPI specification."""
-        response = self._make_request('GET', '/openapi.json')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/openapi.json')
+    
+    def get_openapi_spec_cached(self) -> Dict[str, Any]:
+        """Get OpenAPI specification, reusing an earlier response."""
+        return self._get_static_json('/openapi.json')
+    
+    def get_openapi_spec_keys(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get selected top-level keys of the OpenAPI specification.
+        
+        With ijson installed the spec is stream-parsed and the download stops
+        once every requested key has been seen.
+        """
+        wanted = set(keys)
+        if ijson is None:
+            spec = self.get_openapi_spec()
+            return {key: spec[key] for key in wanted if key in spec}
+        
+        response = self._make_request('GET', '/openapi.json', stream=True)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            found = {}
+            for key, value in ijson.kvitems(response.raw, ''):
+                if key in wanted:
+                    found[key] = value
+                    if len(found) == len(wanted):
+                        break
+            return found
+        finally:
+            response.close()
     
     # Configuration endpoints
     def get_full_config(self) -> Dict[str, Any]:
         """Get full configuration."""
-        response = self._make_request('GET', '/api/config/')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/config/')
     
     def get_agent_configs(self) -> Dict[str, Any]:
         """Get agent configurations."""
-        response = self._make_request('GET', '/api/config/agents')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/config/agents')
     
     def get_agent_config(self, agent_name: str) -> Dict[str, Any]:
         """Get specific agent configuration."""
-        response = self._make_request('GET', f'/api/config/agents/{agent_name}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', f'/api/config/agents/{agent_name}')
     
     def update_agent_config(self, agent_name: str, config: Dict[str, Any]) -> Dict[str, Any]:
         """Update agent configuration."""
-        response = self._make_request('POST', f'/api/config/agents/{agent_name}', json=config)
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('POST', f'/api/config/agents/{agent_name}', json=config)
     
     def get_model_options(self) -> Dict[str, List[str]]:
         """Get available model options."""
-        response = self._make_request('GET', '/api/config/model-options')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/config/model-options')
     
     def get_agent_types(self) -> Dict[str, str]:
         """Get available agent types."""
-        response = self._make_request('GET', '/api/config/agent-types')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/config/agent-types')
+    
+    def get_model_options_cached(self) -> Dict[str, List[str]]:
+        """Get available model options, reusing an earlier response."""
+        return self._get_static_json('/api/config/model-options')
+    
+    def get_agent_types_cached(self) -> Dict[str, str]:
+        """Get available agent types, reusing an earlier response."""
+        return self._get_static_json('/api/config/agent-types')
     
     # API key management
     def store_api_key(self, provider: str, api_key: str) -> Dict[str, Any]:
@@ -89,154 +286,337 @@ class APIClient:
             "provider": provider,
             "api_key": api_key
         }
-        response = self._make_request('POST', '/api/auth/api-keys', json=data)
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('POST', '/api/auth/api-keys', json=data)
+    
+    def store_api_keys(self, api_keys: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Store API keys for several providers in one request."""
+        return self._call('POST', '/api/auth/api-keys/bulk', json=api_keys)
+    
+    async def store_api_keys_async(self, api_keys: Dict[str, str],
+                                   session: Optional["aiohttp.ClientSession"] = None) -> List[Dict[str, Any]]:
+        """Store API keys for several providers without blocking the event loop."""
+        return await self._request_json_async('POST', '/api/auth/api-keys/bulk', session, json=api_keys)
     
     def get_api_keys(self) -> Dict[str, str]:
         """Get all API keys (masked)."""
-        response = self._make_request('GET', '/api/auth/api-keys')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/auth/api-keys')
     
     def get_api_key(self, provider: str) -> Dict[str, Any]:
         """Get specific API key."""
-        response = self._make_request('GET', f'/api/auth/api-keys/{provider}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', f'/api/auth/api-keys/{provider}')
     
     def delete_api_key(self, provider: str) -> Dict[str, Any]:
         """Delete API key."""
-        response = self._make_request('DELETE', f'/api/auth/api-keys/{provider}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('DELETE', f'/api/auth/api-keys/{provider}')
     
     def validate_api_key(self, provider: str) -> Dict[str, Any]:
         """Validate API key."""
-        response = self._make_request('POST', f'/api/auth/api-keys/{provider}/validate')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('POST', f'/api/auth/api-keys/{provider}/validate')
     
     # File operations
-    def upload_file(self, file_path: str, filename: Optional[str] = None) -> Dict[str, Any]:
-        """Upload a file."""
+    def _upload_content_type(self, filename: str, endpoint: str, validate_extension: bool = True) -> str:
+        """Part content type for an upload, rejecting unsupported extensions like the server does."""
+        extension = os.path.splitext(filename)[1].lower()
+        if validate_extension and extension not in self._ALLOWED_EXT:
+            raise self._client_error(
+                endpoint,
+                400,
+                f"File type {extension} not supported. Allowed: {', '.join(self._ALLOWED_EXTENSIONS)}"
+            )
+        return self._UPLOAD_CONTENT_TYPES.get(extension, 'application/octet-stream')
+    
+    def upload_file(self, file_path: str, filename: Optional[str] = None,
+                    validate_extension: bool = True) -> Dict[str, Any]:
+        """Upload a file.
+        
+        Unsupported extensions are rejected locally with the server's 400
+        response unless ``validate_extension`` is False.
+        """
         if filename is None:
-            filename = Path(file_path).name
+            filename = os.path.basename(file_path)
+        
+        content_type = self._upload_content_type(filename, '/api/files/upload', validate_extension)
+        boundary = uuid.uuid4().hex
         
         with open(file_path, 'rb') as f:
-            files = {'file': (filename, f)}
-            # Remove content-type header for file uploads
-            headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'content-type'}
-            response = requests.post(
-                f"{self.base_url}/api/files/upload",
-                files=files,
-                headers=headers
+            # Stream the multipart body (chunked) instead of buffering the whole file
+            response = self._send(
+                'POST',
+                self._upload_url,
+                data=_iter_multipart('file', filename, f, content_type, boundary),
+                headers={'Content-Type': f'multipart/form-data; boundary={boundary}'}
             )
         
         response.raise_for_status()
         return self._get_json(response)
     
+    def upload_files_batch(self, files: Dict[str, str]) -> Dict[str, str]:
+        """Upload several files in one multipart request and return file IDs by name."""
+        if not files:
+            return {}
+        
+        content_types = [
+            self._upload_content_type(filename, '/api/files/upload/batch')
+            for filename in files
+        ]
+        
+        with ExitStack() as stack:
+            parts = [
+                ('files', (filename, stack.enter_context(open(path, 'rb')), content_type))
+                for (filename, path), content_type in zip(files.items(), content_types)
+            ]
+            # Drop the session's JSON Content-Type so requests sets the multipart boundary
+            results = self._call('POST', '/api/files/upload/batch',
+                                 files=parts, headers=self._MULTIPART_HEADERS)
+        
+        return {
+            filename: result['file_id']
+            for filename, result in zip(files, results)
+        }
+    
+    async def upload_file_async(self, file_path: str, filename: Optional[str] = None,
+                                session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Upload a file without blocking the event loop.
+        
+        Uses the given aiohttp ``session`` when there is one, otherwise runs
+        upload_file in the loop's default executor.
+        """
+        if session is None:
+            return await asyncio.get_running_loop().run_in_executor(None, self.upload_file, file_path, filename)
+        
+        if filename is None:
+            filename = os.path.basename(file_path)
+        content_type = self._upload_content_type(filename, '/api/files/upload')
+        
+        with open(file_path, 'rb') as f:
+            form = aiohttp.FormData()
+            form.add_field('file', f, filename=filename, content_type=content_type)
+            
+            async with session.post(
+                self._upload_url,
+                data=form,
+                headers=self._ACCEPT_JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                response.raise_for_status()
+                return orjson.loads(await response.read())
+    
     def get_files(self) -> List[Dict[str, Any]]:
         """Get list of uploaded files."""
-        response = self._make_request('GET', '/api/files/')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/files/')
+    
+    def iter_files(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over uploaded files as the list is received."""
+        return self._iter_json_array('/api/files/')
     
     def get_file_info(self, file_id: str) -> Dict[str, Any]:
         """Get file information."""
-        response = self._make_request('GET', f'/api/files/{file_id}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', f'/api/files/{file_id}')
     
     def delete_file(self, file_id: str) -> Dict[str, Any]:
         """Delete a file."""
-        response = self._make_request('DELETE', f'/api/files/{file_id}')
-        response.raise_for_status()
-        return self._get_json(response)
+        self._preview_cache.pop(file_id, None)
+        return self._call('DELETE', f'/api/files/{file_id}')
+    
+    def delete_files(self, file_ids: List[str]) -> List[str]:
+        """Delete several files in one request and return the IDs that were deleted."""
+        if not file_ids:
+            return []
+        
+        for file_id in file_ids:
+            self._preview_cache.pop(file_id, None)
+        result = self._call('DELETE', '/api/files/', params={'ids': list(file_ids)})
+        
+        for file_id in result['not_found']:
+            logger.warning(f"Failed to delete file {file_id}: File not found")
+        return result['deleted']
     
     def preview_file(self, file_id: str) -> Dict[str, Any]:
         """Get file preview."""
-        response = self._make_request('GET', f'/api/files/{file_id}/preview')
-        response.raise_for_status()
-        return self._get_json(response)
-    
-    def process_file(self, file_id: str) -> Dict[str, Any]:
-        """Process a file."""
-        response = self._make_request('POST', f'/api/files/{file_id}/process')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', f'/api/files/{file_id}/preview')
+    
+    def preview_file_cached(self, file_id: str) -> Dict[str, Any]:
+        """Get file preview, reusing an earlier response for the same file."""
+        preview = self._preview_cache.get(file_id)
+        if preview is None:
+            preview = self.preview_file(file_id)
+            self._preview_cache[file_id] = preview
+        return preview
+    
+    def process_file(self, file_id: str, include_preview: bool = False) -> Dict[str, Any]:
+        """Process a file, optionally returning its preview and summary in the same response."""
+        self._preview_cache.pop(file_id, None)
+        params = {'include_preview': 'true'} if include_preview else None
+        return self._call('POST', f'/api/files/{file_id}/process', params=params)
     
     # Crew execution
+    def _check_prompt(self, execution_request: Dict[str, Any]) -> None:
+        """Reject prompts the server's schema would reject, with the same 422."""
+        prompt = execution_request.get("prompt") or ""
+        if len(prompt) < self._MIN_PROMPT_LENGTH:
+            raise self._client_error(
+                '/api/crew/execute', 422,
+                f"String should have at least {self._MIN_PROMPT_LENGTH} characters"
+            )
+    
     def execute_crew(self, execution_request: Dict[str, Any]) -> Dict[str, Any]:
         """Execute crew."""
-        response = self._make_request('POST', '/api/crew/execute', json=execution_request)
-        response.raise_for_status()
-        return self._get_json(response)
+        self._check_prompt(execution_request)
+        
+        return self._call('POST', '/api/crew/execute', json=execution_request)
+    
+    async def execute_crew_async(self, execution_request: Dict[str, Any],
+                                 session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Execute crew without blocking the event loop.
+        
+        Uses the given aiohttp ``session`` when there is one, otherwise runs
+        execute_crew in the loop's default executor.
+        """
+        if session is None:
+            return await asyncio.get_running_loop().run_in_executor(None, self.execute_crew, execution_request)
+        
+        self._check_prompt(execution_request)
+        
+        return await self._request_json_async('POST', '/api/crew/execute', session, json=execution_request)
     
     def get_execution_status(self, execution_id: str) -> Dict[str, Any]:
         """Get execution status."""
-        response = self._make_request('GET', f'/api/crew/status/{execution_id}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', f'/api/crew/status/{execution_id}')
+    
+    async def get_execution_status_async(self, execution_id: str,
+                                         session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Get execution status without blocking the event loop."""
+        return await self._request_json_async('GET', f'/api/crew/status/{execution_id}', session)
     
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """Get execution history."""
-        response = self._make_request('GET', '/api/crew/executions')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/crew/executions')
+    
+    def iter_execution_history(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over execution history as it is received."""
+        return self._iter_json_array('/api/crew/executions')
     
     def cancel_execution(self, execution_id: str) -> Dict[str, Any]:
         """Cancel execution."""
-        response = self._make_request('DELETE', f'/api/crew/executions/{execution_id}')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('DELETE', f'/api/crew/executions/{execution_id}')
+    
+    async def cancel_execution_async(self, execution_id: str,
+                                     session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Cancel execution without blocking the event loop."""
+        return await self._request_json_async('DELETE', f'/api/crew/executions/{execution_id}', session)
     
     # WebSocket info
     def get_websocket_info(self) -> Dict[str, Any]:
         """Get WebSocket connection info."""
-        response = self._make_request('GET', '/api/ws/info')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('GET', '/api/ws/info')
+    
+    async def get_websocket_info_async(self, session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Get WebSocket connection info without blocking the event loop."""
+        return await self._request_json_async('GET', '/api/ws/info', session)
     
     def websocket_broadcast(self, message: Dict[str, Any]) -> Dict[str, Any]:
         """Broadcast message to WebSocket clients."""
-        response = self._make_request('POST', '/api/ws/broadcast', json=message)
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('POST', '/api/ws/broadcast', json=message)
+    
+    async def websocket_broadcast_async(self, message: Dict[str, Any],
+                                        session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Broadcast message to WebSocket clients without blocking the event loop."""
+        return await self._request_json_async('POST', '/api/ws/broadcast', session, json=message)
     
     def websocket_cleanup(self) -> Dict[str, Any]:
         """Clean up WebSocket connections."""
-        response = self._make_request('POST', '/api/ws/cleanup')
-        response.raise_for_status()
-        return self._get_json(response)
+        return self._call('POST', '/api/ws/cleanup')
+    
+    async def websocket_cleanup_async(self, session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Clean up WebSocket connections without blocking the event loop."""
+        return await self._request_json_async('POST', '/api/ws/cleanup', session)
     
     # Utility methods
     def wait_for_execution(self, execution_id: str, timeout: int = 30) -> Dict[str, Any]:
-        """Wait for execution to complete."""
+        """Wait for execution to complete, polling with exponential backoff."""
         start_time = time.time()
+        interval = 0.025
         
         while time.time() - start_time < timeout:
             status = self.get_execution_status(execution_id)
-            if status.get('status') in ['completed', 'failed', 'cancelled']:
+            if status.get('status') in self._TERMINAL_STATUSES:
                 return status
-            time.sleep(1)
+            time.sleep(interval)
+            interval = min(interval * 1.5, 0.5)
         
         raise TimeoutError(f"Execution {execution_id} did not complete within {timeout} seconds")
     
-    def upload_test_files(self, test_files: Dict[str, str]) -> Dict[str, str]:
-        """Upload test files and return file IDs."""
-        file_ids = {}
+    async def wait_for_execution_async(self, execution_id: str, timeout: float = 30,
+                                       websocket_client: Optional[WebSocketTestClient] = None,
+                                       session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+        """Wait for execution to complete using its WebSocket completion event.
+        
+        Subscribes to the execution (on ``websocket_client`` if given, otherwise
+        on a short-lived connection) and reads the final status over HTTP once
+        the completion update arrives, or once when ``timeout`` runs out.
+        """
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        
+        async def on_update(message: Dict[str, Any]) -> None:
+            data = message.get("data") or {}
+            if (message.get("execution_id") == execution_id and not done.done() and
+                    (data.get("type") == "completion" or data.get("status") in self._TERMINAL_STATUSES)):
+                done.set_result(message)
         
-        for name, path in test_files.items():
-            if name.endswith('.json'):
-                continue  # Skip config files
+        client = websocket_client or WebSocketTestClient(self.ws_url)
+        if websocket_client is None:
+            await client.connect()
+        previous_handler = client.message_handlers.get("execution_update")
+        client.add_message_handler("execution_update", on_update)
+        
+        try:
+            await client.subscribe(execution_id)
+            
+            # The execution may have finished before the subscription was registered
+            status = await self.get_execution_status_async(execution_id, session)
+            if status.get('status') in self._TERMINAL_STATUSES:
+                return status
             
-            result = self.upload_file(path, name)
-            file_ids[name] = result['file_id']
+            try:
+                await asyncio.wait_for(done, timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            if previous_handler is not None:
+                client.add_message_handler("execution_update", previous_handler)
+            else:
+                client.remove_message_handler("execution_update")
+            if websocket_client is None:
+                await client.disconnect()
         
-        return file_ids
+        status = await self.get_execution_status_async(execution_id, session)
+        if status.get('status') in self._TERMINAL_STATUSES:
+            return status
+        
+        raise TimeoutError(f"Execution {execution_id} did not complete within {timeout} seconds")
+    
+    def upload_test_files(self, test_files: Dict[str, str]) -> Dict[str, str]:
+        """Upload test files and return file IDs."""
+        # Skip config files and send the rest in one batch request
+        return self.upload_files_batch({
+            name: path for name, path in test_files.items() if not name.endswith('.json')
+        })
+    
+    async def upload_test_files_async(self, test_files: Dict[str, str],
+                                      session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, str]:
+        """Upload test files concurrently and return file IDs."""
+        names = [name for name in test_files if not name.endswith('.json')]  # Skip config files
+        results = await asyncio.gather(
+            *(self.upload_file_async(test_files[name], name, session) for name in names)
+        )
+        return {name: result['file_id'] for name, result in zip(names, results)}
     
     def setup_test_api_keys(self, test_config: Dict[str, Any]) -> None:
         """Set up test API keys."""
-        for provider, api_key in test_config['test_api_keys'].items():
-            self.store_api_key(provider, api_key)
\ No newline at end of file
+        self.store_api_keys(test_config['test_api_keys'])
+    
+    async def setup_test_api_keys_async(self, test_config: Dict[str, Any],
+                                        session: Optional["aiohttp.ClientSession"] = None) -> None:
+        """Set up test API keys without blocking the event loop."""
+        await self.store_api_keys_async(test_config['test_api_keys'], session)
\ No newline at end of file
@@ -2,22 +2,54 @@ import asyncio
 import json
 import websockets
 import logging
-from typing import Dict, Any, Optional, List, Callable
+import time
+from collections import Counter, defaultdict, deque
+from typing import Dict, Any, Optional, List, Callable, DefaultDict, AsyncIterator, Deque, Tuple
 from datetime import datetime
 import uuid
+from functools import partial
+
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        # Text frames: the server reads messages with receive_text
+        return orjson.dumps(obj).decode()
+    
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    _dumps = json.dumps
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
 class WebSocketTestClient:
     """WebSocket client for testing real-time functionality."""
     
+    # Messages kept in the log and in each per-type bucket
+    _HISTORY_SIZE = 10_000
+    
     def __init__(self, ws_url: str):
         self.ws_url = ws_url
         self.websocket = None
         self.client_id = None
         self.connected = False
-        self.messages: List[Dict[str, Any]] = []
+        self.message_log: Deque[Dict[str, Any]] = deque(maxlen=self._HISTORY_SIZE)
+        self.messages_by_type: DefaultDict[str, Deque[Dict[str, Any]]] = defaultdict(
+            partial(deque, maxlen=self._HISTORY_SIZE)
+        )
         self.subscriptions: set = set()
+        self.counts: Counter = Counter()
+        self._messages_by_execution: DefaultDict[str, Deque[Dict[str, Any]]] = defaultdict(
+            partial(deque, maxlen=self._HISTORY_SIZE)
+        )
+        self._execution_queues: DefaultDict[str, asyncio.Queue] = defaultdict(
+            partial(asyncio.Queue, maxsize=self._HISTORY_SIZE)
+        )
+        self._completion_events: DefaultDict[str, asyncio.Event] = defaultdict(asyncio.Event)
+        self._completions: Dict[str, Dict[str, Any]] = {}
+        self._message_arrived = asyncio.Condition()
+        self._waiters: DefaultDict[str, Deque[Tuple[asyncio.Future, Optional[Callable]]]] = defaultdict(deque)
         self.message_handlers: Dict[str, Callable] = {}
         self.connection_timeout = 10.0
         self.message_timeout = 5.0
@@ -30,9 +62,13 @@ class WebSocketTestClient:
             if client_id:
                 url += f"?client_id={client_id}"
             
+            # Negotiate permessage-deflate, and buffer bursts of updates
+            # without pausing reads from the socket
             self.websocket = await websockets.connect(
                 url,
-                timeout=self.connection_timeout
+                open_timeout=self.connection_timeout,
+                compression="deflate",
+                max_queue=1024
             )
             self.connected = True
             
@@ -40,9 +76,7 @@ class WebSocketTestClient:
             asyncio.create_task(self._message_listener())
             
             # Wait for welcome message to get client_id
-            welcome_msg = await self.wait_for_message("system", timeout=5.0)
-            if welcome_msg and "Client ID:" in welcome_msg.get("message", ""):
-                self.client_id = welcome_msg["message"].split("Client ID: ")[1]
+            await self.wait_until_connected(timeout=5.0)
             
             logger.info(f"Connected to WebSocket with client_id: {self.client_id}")
             return self.client_id
@@ -51,6 +85,24 @@ class WebSocketTestClient:
             logger.error(f"Failed to connect to WebSocket: {e}")
             raise
     
+    async def wait_until_connected(self, timeout: float = None) -> Dict[str, Any]:
+        """Wait for the server's welcome message and record the client ID from it.
+        
+        Only a welcome received after the call counts, so a reconnect never
+        picks up the previous connection's client ID. connect() awaits this
+        straight after starting the listener, before any message is read.
+        """
+        welcome_msg = await self._wait_for_next(
+            "system",
+            timeout,
+            predicate=lambda msg: "Client ID:" in msg.get("message", "")
+        )
+        if welcome_msg is None:
+            raise Exception("No welcome message received from WebSocket server")
+        
+        self.client_id = welcome_msg["message"].split("Client ID: ")[1]
+        return welcome_msg
+    
     async def disconnect(self):
         """Disconnect from WebSocket server."""
         if self.websocket and self.connected:
@@ -63,12 +115,34 @@ class WebSocketTestClient:
         try:
             async for message in self.websocket:
                 try:
-                    data = json.loads(message)
-                    data["received_at"] = datetime.now().isoformat()
-                    self.messages.append(data)
+                    data = _loads(message)
+                    data["received_at"] = time.time()
+                    msg_type = data.get("type")
+                    self.message_log.append(data)
+                    self.messages_by_type[msg_type].append(data)
+                    self.counts[msg_type] += 1
+                    
+                    # Queue execution messages for next_event consumers, dropping
+                    # the oldest when nobody drains the queue
+                    execution_id = data.get("execution_id")
+                    if execution_id:
+                        queue = self._execution_queues[execution_id]
+                        if queue.full():
+                            queue.get_nowait()
+                        queue.put_nowait(data)
+                        self._messages_by_execution[execution_id].append(data)
+                        
+                        # Record completion and wake wait_for_completion callers
+                        if msg_type == "execution_update" and (data.get("data") or {}).get("type") == "completion":
+                            self._completions[execution_id] = data
+                            self._completion_events[execution_id].set()
+                    
+                    # Resolve waiters for this message type, then wake anyone watching the history
+                    self._resolve_waiters(msg_type, data)
+                    async with self._message_arrived:
+                        self._message_arrived.notify_all()
                     
                     # Call message handler if registered
-                    msg_type = data.get("type")
                     if msg_type in self.message_handlers:
                         await self.message_handlers[msg_type](data)
                     
@@ -90,7 +164,7 @@ class WebSocketTestClient:
             raise Exception("WebSocket not connected")
         
         try:
-            await self.websocket.send(json.dumps(message))
+            await self.websocket.send(_dumps(message))
             logger.debug(f"Sent message: {message}")
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
@@ -123,7 +197,7 @@ class WebSocketTestClient:
         """Send ping message."""
         await self.send_message({
             "type": "ping",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time()
         })
     
     async def get_status(self) -> None:
@@ -132,67 +206,153 @@ class WebSocketTestClient:
             "type": "get_status"
         })
     
-    def wait_for_message(self, message_type: str, timeout: float = None) -> Optional[Dict[str, Any]]:
-        """Wait for a specific message type."""
-        return asyncio.create_task(self._wait_for_message(message_type, timeout))
+    async def wait_for_message(self, message_type: str, timeout: float = None,
+                               predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """Wait for a specific message type.
+        
+        Returns the latest matching message already received, otherwise waits
+        for the listener to hand over the next one. If `predicate` is given,
+        only messages of the type for which it returns True are matched.
+        """
+        for msg in reversed(self.messages_by_type.get(message_type, ())):
+            if predicate is None or predicate(msg):
+                return msg
+        
+        return await self._wait_for_next(message_type, timeout, predicate)
     
-    async def _wait_for_message(self, message_type: str, timeout: float = None) -> Optional[Dict[str, Any]]:
-        """Async implementation of wait_for_message."""
+    async def _wait_for_next(self, message_type: str, timeout: float = None,
+                             predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the listener to hand over the next matching message, ignoring history."""
         timeout = timeout or self.message_timeout
-        start_time = asyncio.get_event_loop().time()
-        
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            for msg in reversed(self.messages):
-                if msg.get("type") == message_type:
-                    return msg
-            await asyncio.sleep(0.1)
+        waiter = (asyncio.get_running_loop().create_future(), predicate)
+        waiters = self._waiters[message_type]
+        waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter[0], timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+    
+    def _resolve_waiters(self, message_type: str, message: Dict[str, Any]) -> None:
+        """Hand a received message to every waiter for its type that it matches."""
+        waiters = self._waiters.get(message_type)
+        if not waiters:
+            return
         
-        return None
+        for waiter in list(waiters):
+            future, predicate = waiter
+            if future.done():
+                waiters.remove(waiter)
+            elif predicate is None or predicate(message):
+                future.set_result(message)
+                waiters.remove(waiter)
     
     async def wait_for_execution_update(self, execution_id: str, timeout: float = None) -> Optional[Dict[str, Any]]:
         """Wait for execution update message."""
-        timeout = timeout or self.message_timeout
-        start_time = asyncio.get_event_loop().time()
-        
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            for msg in reversed(self.messages):
-                if (msg.get("type") == "execution_update" and 
-                    msg.get("execution_id") == execution_id):
-                    return msg
-            await asyncio.sleep(0.1)
+        for msg in reversed(self._messages_by_execution.get(execution_id, ())):
+            if msg.get("type") == "execution_update":
+                return msg
         
-        return None
+        return await self._wait_for_next(
+            "execution_update",
+            timeout,
+            predicate=lambda msg: msg.get("execution_id") == execution_id
+        )
     
     async def wait_for_completion(self, execution_id: str, timeout: float = 60.0) -> Optional[Dict[str, Any]]:
         """Wait for execution completion."""
-        start_time = asyncio.get_event_loop().time()
+        timeout = timeout or self.message_timeout
+        try:
+            await asyncio.wait_for(self._completion_events[execution_id].wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self._completions.get(execution_id)
+    
+    async def wait_for_messages(self, message_type: str, count: int, timeout: float = None) -> List[Dict[str, Any]]:
+        """Wait until at least `count` messages of a type have arrived.
+        
+        Returns the messages of that type still held in its bucket, which is
+        fewer than `count` if the timeout expired first.
+        """
+        await self.wait_for_count(message_type, count, timeout)
+        return self.get_messages(message_type)
+    
+    async def wait_for_count(self, message_type: str, count: int, timeout: float = None) -> bool:
+        """Wait until `count` messages of a type have arrived since the last clear.
+        
+        Returns False if the timeout expired first.
+        """
+        timeout = timeout or self.message_timeout
+        try:
+            async with self._message_arrived:
+                await asyncio.wait_for(
+                    self._message_arrived.wait_for(lambda: self.counts[message_type] >= count),
+                    timeout
+                )
+        except asyncio.TimeoutError:
+            return False
+        return True
+    
+    async def wait_for_first_message(self, execution_id: str, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Wait until a message for an execution has arrived and return the first one."""
+        timeout = timeout or self.message_timeout
+        try:
+            async with self._message_arrived:
+                await asyncio.wait_for(
+                    self._message_arrived.wait_for(lambda: bool(self._messages_by_execution.get(execution_id))),
+                    timeout
+                )
+        except asyncio.TimeoutError:
+            return None
+        return self._messages_by_execution[execution_id][0]
+    
+    async def next_event(self, execution_id: str, timeout: float = None) -> Dict[str, Any]:
+        """Wait for the next unseen message for an execution.
         
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            for msg in reversed(self.messages):
-                if (msg.get("type") == "execution_update" and 
-                    msg.get("execution_id") == execution_id and
-                    msg.get("data", {}).get("type") == "completion"):
-                    return msg
-            await asyncio.sleep(0.5)
+        Raises asyncio.TimeoutError if none arrives within ``timeout``.
+        """
+        timeout = timeout or self.message_timeout
+        return await asyncio.wait_for(self._execution_queues[execution_id].get(), timeout)
+    
+    async def stream(self, execution_id: str, timeout: float = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield messages for an execution as they arrive, until `timeout` seconds have passed."""
+        timeout = timeout or self.message_timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        return None
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                yield await self.next_event(execution_id, timeout=remaining)
+            except asyncio.TimeoutError:
+                return
     
     def get_messages(self, message_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all messages or messages of specific type."""
         if message_type:
-            return [msg for msg in self.messages if msg.get("type") == message_type]
-        return self.messages.copy()
+            return list(self.messages_by_type.get(message_type, ()))
+        return list(self.message_log)
     
     def get_execution_messages(self, execution_id: str) -> List[Dict[str, Any]]:
         """Get all messages for a specific execution."""
-        return [
-            msg for msg in self.messages 
-            if msg.get("execution_id") == execution_id
-        ]
+        return list(self._messages_by_execution.get(execution_id, ()))
     
     def clear_messages(self) -> None:
         """Clear message history."""
-        self.messages.clear()
+        self.message_log.clear()
+        self.messages_by_type.clear()
+        self.counts.clear()
+        self._messages_by_execution.clear()
+        self._completions.clear()
+        
+        # Keep the queues and pending events that next_event/stream and
+        # wait_for_completion callers may be waiting on; only drop their contents
+        for queue in self._execution_queues.values():
+            while not queue.empty():
+                queue.get_nowait()
+        for execution_id in [eid for eid, event in self._completion_events.items() if event.is_set()]:
+            del self._completion_events[execution_id]
     
     def add_message_handler(self, message_type: str, handler: Callable) -> None:
         """Add message handler for specific message type."""
@@ -210,14 +370,14 @@ class WebSocketTestClient:
             "connected": self.connected,
             "ws_url": self.ws_url,
             "subscriptions": list(self.subscriptions),
-            "message_count": len(self.messages)
+            "message_count": len(self.message_log)
         }
     
     async def test_connection(self) -> bool:
         """Test WebSocket connection with ping/pong."""
         try:
             await self.ping()
-            pong_msg = await self._wait_for_message("pong", timeout=5.0)
+            pong_msg = await self.wait_for_message("pong", timeout=5.0)
             return pong_msg is not None
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
@@ -279,14 +439,8 @@ async def simulate_execution_streaming(client: WebSocketTestClient, execution_id
     await client.subscribe(execution_id)
     
     # Record messages for 10 seconds or until completion
-    start_time = asyncio.get_event_loop().time()
-    while asyncio.get_event_loop().time() - start_time < 10.0:
-        # Check for completion
-        completion_msg = await client.wait_for_completion(execution_id, timeout=0.1)
-        if completion_msg:
-            messages.extend(client.get_execution_messages(execution_id))
-            break
-        
-        await asyncio.sleep(0.5)
+    completion_msg = await client.wait_for_completion(execution_id, timeout=10.0)
+    if completion_msg:
+        messages.extend(client.get_execution_messages(execution_id))
     
     return messages
\ No newline at end of file